@@ -9,18 +9,21 @@ from datetime import datetime
 import glob
 import json
 import gzip
-import csv
+import hashlib
 import shutil
+import tempfile
+import functools
 import threading
 import yaml
 import math
 import numpy as np
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import xml.etree.ElementTree as ET
 from timeloop_utils.construct_workloads.create_model import create_pytorch_model
 from timeloop_utils.construct_workloads.parse_model import parse_pytorch_model
 from timeloop_utils.construct_workloads.construct_workloads import json_file_to_dict, construct_workloads
-from typing import Tuple, Dict, Optional, Any, Union
+from typing import Tuple, Dict, List, Optional, Any, Union
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -53,6 +56,29 @@ def dict_to_json(dictionary: Dict, filename: str) -> None:
         json.dump(dictionary, json_file, indent=2, cls=JSONEncoder)
 
 
+def merge_configs(merged: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recursively merges a YAML configuration into another one, the way Timeloop and Accelergy combine multiple input files.
+
+    Nested dictionaries are merged, lists (e.g. component classes spread across multiple files) are concatenated and other values are overwritten.
+
+    Args:
+        merged (Dict[str, Any]): The configuration to merge into (modified in place).
+        config (Dict[str, Any]): The configuration to be merged.
+
+    Returns:
+        Dict[str, Any]: The merged configuration.
+    """
+    for key, value in config.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merge_configs(merged[key], value)
+        elif isinstance(value, list) and isinstance(merged.get(key), list):
+            merged[key] = merged[key] + value
+        else:
+            merged[key] = value
+    return merged
+
+
 def get_stat(stats: ET.Element, stat: str, cast: type) -> np.ndarray:
     """
     Extracts statistics from XML data.
@@ -362,6 +388,74 @@ def parse_experiments_json(filename: str, result_dict: dict, experiments: list =
     return result_dict
 
 
+def _temp_file_beside(file_path: str) -> str:
+    """
+    Creates a uniquely named temporary file in the directory of the given file, to be atomically moved over it once written.
+
+    The name is unique across both processes and threads, so concurrent writers of the same file never share it. Unlike
+    with tempfile.mkstemp (always 0600), the file gets the usual umask-based permissions, which the final file keeps.
+
+    Args:
+        file_path (str): Path to the file to be written.
+
+    Returns:
+        str: Path to the created (empty) temporary file.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    while True:
+        tmp_path = f"{file_path}.{os.urandom(8).hex()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return tmp_path
+
+
+@functools.lru_cache(maxsize=None)
+def _tools_digest(mode: str) -> bytes:
+    """
+    Computes the digest of the installed Timeloop and Accelergy tools, which the energy and area reference tables depend on.
+
+    It covers the Accelergy version, the location and modification time of the tool executables and the Accelergy configuration
+    (listing its plugins and primitive component tables). Computed once per process.
+
+    Args:
+        mode (str): Name of the Timeloop executable.
+
+    Returns:
+        bytes: The resulting digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for tool in [mode, "accelergy"]:
+        tool_path = shutil.which(tool)
+        if tool_path is not None:
+            stat = os.stat(tool_path)
+            digest.update(f"{tool_path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    try:
+        version = subprocess.run(["accelergy", "--version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False).stdout
+    except OSError:
+        version = b""
+    digest.update(version)
+    accelergy_config = os.path.expanduser("~/.config/accelergy/accelergy_config.yaml")
+    if os.path.exists(accelergy_config):
+        with open(accelergy_config, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def _pin_worker_cpus(cpu_sets: "multiprocessing.Queue") -> None:
+    """
+    Pins the calling worker process (and the timeloop-mapper processes it spawns) to its own set of CPUs.
+
+    Args:
+        cpu_sets (multiprocessing.Queue): A queue of disjoint CPU sets, one for each worker process.
+    """
+    cpu_set = cpu_sets.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpu_set)
+
+
 class MapperFacade:
     """Class represents the facade interface for calling timeloop mapper and retrieve hardware metrics.
 
@@ -372,10 +466,14 @@ class MapperFacade:
         configs_rel_path (str): Relative path to the timeloop configs folder.
         architecture (str): Name of the architecture to be used along with its associated components and constraints.
     """
+    # YAML files of created/parsed models shared by all instances within the process, keyed by the creation/parsing arguments
+    _model_yamls = {}
+
     def __init__(self, configs_rel_path: str = "timeloop_utils/timeloop_configs", architecture: str = "eyeriss") -> None:
         self._architecture = architecture
         self._mode = f"timeloop-mapper"
         self._thread_id = threading.get_ident()
+        self._out_prefix = f"{self._mode}_{self._thread_id}"
 
         # Get the absolute directory of this script
         self._DIR_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -385,6 +483,167 @@ class MapperFacade:
         self.constraints = glob.glob(f"{self.configs_path}/architectures/{architecture}/constraints/*.yaml")
         self.sparse_opt = glob.glob(f"{self.configs_path}/architectures/{architecture}/sparse_opt/*.yaml")
 
+        # Digest of the static architecture inputs and in-memory level of the mapper results lookup table
+        self._arch_digest = self._hash_files([self.arch] + self.components + self.constraints + self.sparse_opt)
+        self._mapper_lut = {}
+
+        # Prefix of the files derived solely from the architecture inputs, i.e. their merged form
+        self._arch_cache_prefix = f"{self.configs_path}/.cache/{architecture}_{self._arch_digest.hex()}"
+
+        # Invariant part of the timeloop-mapper command line and modified mapper configurations for the used settings
+        self._argv_prefix = [self._mode, self._merge_arch_configs()]
+        self._mapper_template = f"{self.configs_path}/mapper_heuristics/mapper_template.yaml"
+        self._mapper_configs = {}
+
+        # Sink for the output of non-verbose mapper calls, kept open for the lifetime of the facade
+        self._devnull = open(os.devnull, "wb")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Returns the picklable state of the facade (e.g. when passing it to worker processes), leaving out the open devnull file
+        and the in-memory lookup table and mapper configurations, which the workers do not use (and which grow over a run).
+
+        Returns:
+            Dict[str, Any]: The state of the facade.
+        """
+        state = self.__dict__.copy()
+        del state["_devnull"], state["_mapper_lut"], state["_mapper_configs"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restores the facade from its pickled state, reopening the devnull file and starting with empty in-memory memos.
+
+        Args:
+            state (Dict[str, Any]): The state of the facade.
+        """
+        self.__dict__.update(state)
+        self._mapper_lut = {}
+        self._mapper_configs = {}
+        self._devnull = open(os.devnull, "wb")
+
+    def __del__(self) -> None:
+        """
+        Closes the devnull file once the facade is garbage collected.
+        """
+        if getattr(self, "_devnull", None) is not None:
+            self._devnull.close()
+
+    def _hash_files(self, file_paths: List[str]) -> bytes:
+        """
+        Computes a digest over the contents of the given files.
+
+        Args:
+            file_paths (List[str]): The paths to the files to be hashed (the order matters).
+
+        Returns:
+            bytes: The resulting digest.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for file_path in file_paths:
+            with open(file_path, "rb") as f:
+                digest.update(f.read())
+        return digest.digest()
+
+    def _mapper_lut_key(self, workload: str, mapper_config: Dict[str, Any]) -> str:
+        """
+        Computes the lookup table key of a timeloop-mapper run.
+
+        The key covers the contents of the architecture, components, constraints and workload files together with the
+        mapper settings, so identical layer shapes with identical settings map to the same key regardless of their names.
+        It also covers the installed tools, so upgrading Timeloop, Accelergy or its plugins invalidates the stored results.
+
+        Args:
+            workload (str): Relative path to the workload configuration file.
+            mapper_config (Dict[str, Any]): The modified mapper configuration dictionary.
+
+        Returns:
+            str: The hexadecimal lookup table key.
+        """
+        # The output prefix only names the output files, it does not affect the results
+        mapper_settings = {k: v for k, v in mapper_config["mapper"].items() if k != "out_prefix"}
+        digest = hashlib.blake2b(self._arch_digest, digest_size=16)
+        digest.update(_tools_digest(self._mode))
+        digest.update(self._hash_files([workload]))
+        digest.update(json.dumps(mapper_settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _merge_arch_configs(self) -> str:
+        """
+        Merges the architecture, components, constraints and sparse optimization files into a single timeloop-mapper input file.
+
+        The merged file is named after the digest of its sources, so it is only regenerated when any of them changes.
+
+        Returns:
+            str: Path to the merged architecture file.
+        """
+        merged_arch = f"{self._arch_cache_prefix}.merged.yaml"
+        if not os.path.exists(merged_arch):
+            merged = {}
+            for config_file in [self.arch] + self.components + self.constraints + self.sparse_opt:
+                with open(config_file, "r") as f:
+                    merge_configs(merged, yaml.safe_load(f))
+
+            # Write atomically, as other processes or threads may be reading the merged file
+            tmp_path = _temp_file_beside(merged_arch)
+            with open(tmp_path, "w") as f:
+                yaml.dump(merged, f, sort_keys=False)
+            os.replace(tmp_path, merged_arch)
+        return merged_arch
+
+    def _energy_tables_prefix(self, cache_dir: str) -> str:
+        """
+        Returns the path prefix of the stored Accelergy energy and area reference tables (ERT and ART) of the architecture.
+
+        The tables are stored within the cache directory (so deleting it resets them) and keyed by the digest of both
+        the architecture inputs and the installed tools, so updating Accelergy, its plugins or Timeloop regenerates them.
+
+        Args:
+            cache_dir (str): Relative path to the cache directory where the tables are stored.
+
+        Returns:
+            str: The path prefix of the ERT and ART files.
+        """
+        digest = hashlib.blake2b(self._arch_digest, digest_size=16)
+        digest.update(_tools_digest(self._mode))
+        # Absolute, as timeloop-mapper runs within its own output directory
+        return os.path.abspath(os.path.join(cache_dir, "energy_tables", f"{self._architecture}_{digest.hexdigest()}"))
+
+    def _energy_tables(self, cache_dir: str) -> List[str]:
+        """
+        Retrieves the stored Accelergy energy and area reference tables (ERT and ART) of the architecture.
+
+        When passed to timeloop-mapper alongside the architecture, it skips invoking Accelergy to generate them again.
+
+        Args:
+            cache_dir (str): Relative path to the cache directory where the tables are stored.
+
+        Returns:
+            List[str]: Paths to the stored ERT and ART files, or an empty list if they were not generated yet.
+        """
+        prefix = self._energy_tables_prefix(cache_dir)
+        ert, art = f"{prefix}.ERT.yaml", f"{prefix}.ART.yaml"
+        if not os.path.exists(ert):
+            return []
+        return [ert, art] if os.path.exists(art) else [ert]
+
+    def _store_energy_tables(self, tmp_dir: str, cache_dir: str) -> None:
+        """
+        Stores the Accelergy energy and area reference tables generated by a timeloop-mapper call for reuse by the subsequent calls.
+
+        Args:
+            tmp_dir (str): Path to the output directory of the timeloop-mapper call.
+            cache_dir (str): Relative path to the cache directory where the tables are stored.
+        """
+        prefix = self._energy_tables_prefix(cache_dir)
+        # ART goes first, as the presence of the ERT marks the tables as available
+        for table in ["ART", "ERT"]:
+            generated_table = f"{tmp_dir}/{self._out_prefix}.{table}.yaml"
+            if os.path.exists(generated_table):
+                tmp_path = _temp_file_beside(f"{prefix}.{table}.yaml")
+                shutil.copyfile(generated_table, tmp_path)
+                os.replace(tmp_path, f"{prefix}.{table}.yaml")
+
     def _load_cache(self, cache_file_path: str) -> Dict[str, Any]:
         """
         Load the cache from a gzip-compressed JSON file.
@@ -429,7 +688,7 @@ class MapperFacade:
         Returns:
             Dict[str, Any]: The modified mapper configuration dictionary.
         """
-        mapper_config["mapper"]["out_prefix"] = f"{self._mode}_{self._thread_id}"
+        mapper_config["mapper"]["out_prefix"] = self._out_prefix
         mapper_config["mapper"]["optimization-metrics"] = list(metrics) if metrics[1] else [metrics[0]]
         mapper_config["mapper"]["search-size"] = total_valid
 
@@ -467,6 +726,61 @@ class MapperFacade:
 
         return mapper_config
 
+    def _lookup_mapper_lut(self, lut_key: str, cache_dir: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up the results of a previous mapper run in the in-memory and on-disk lookup table.
+
+        Args:
+            lut_key (str): The lookup table key of the mapper run.
+            cache_dir (str): Relative path to the cache directory where the lookup table is stored.
+
+        Returns:
+            Optional[Dict[str, Any]]: The stored mapper results if found, None otherwise.
+        """
+        if lut_key not in self._mapper_lut:
+            lut_entry = self._load_cache(os.path.join(cache_dir, "mapper_lut", f"{lut_key}.json.gz"))
+            if not lut_entry:
+                return None
+            self._mapper_lut[lut_key] = lut_entry
+        return self._mapper_lut[lut_key]
+
+    def _store_mapper_lut(self, lut_key: str, result_dict: Dict[str, Any], cache_dir: str) -> None:
+        """
+        Stores the results of a mapper run into the in-memory and on-disk lookup table.
+
+        Args:
+            lut_key (str): The lookup table key of the mapper run.
+            result_dict (Dict[str, Any]): The mapper results to be stored.
+            cache_dir (str): Relative path to the cache directory where the lookup table is stored.
+        """
+        self._mapper_lut[lut_key] = result_dict
+        # Write atomically, as other processes or threads may be reading the lookup table
+        lut_file_path = os.path.join(cache_dir, "mapper_lut", f"{lut_key}.json.gz")
+        tmp_path = _temp_file_beside(lut_file_path)
+        self._save_cache(result_dict, tmp_path)
+        os.replace(tmp_path, lut_file_path)
+
+    def _cache_entry(self, layer: str, bitwidth: str, batch_size: int, threads: Union[str, int], heuristic: str, metrics: Tuple[str, str], total_valid: int, result_dict: Dict[str, Any], runtime: float) -> Dict[str, Any]:
+        """
+        Creates the cache entry of a single workload from the mapper results and the used mapper settings.
+
+        Args:
+            layer (str): Name of the workload.
+            bitwidth (str): The bitwidth configuration.
+            batch_size (int): The batch size used.
+            threads (Union[str, int]): The number of threads used, or 'all' for all available threads.
+            heuristic (str): The heuristic type used.
+            metrics (Tuple[str, str]): A tuple of the optimized metrics.
+            total_valid (int): The number of total valid mappings considered.
+            result_dict (Dict[str, Any]): The best mapping's hardware parameters.
+            runtime (float): The runtime of retrieving the hardware parameters.
+
+        Returns:
+            Dict[str, Any]: The cache entry.
+        """
+        threads = threads if threads != "all" else multiprocessing.cpu_count()
+        return {"Mode": self._mode, "HW": self._architecture, "Workload": layer, "Bitwidths": bitwidth, "Batch_size": batch_size, "Mapper heuristic": heuristic, "Total valid": total_valid, "Threads": threads, "Optimized_metric_1": metrics[0], "Optimized_metric_2": metrics[1], **result_dict, "Runtime [s]": "{:.2f}".format(runtime)}
+
     def run_one_workload(self, workload: str, bitwidth: str, batch_size: int = 1, threads: Union[str, int] = "all", heuristic: str = "random", metrics: Tuple[str, str] = ("edp", ""), total_valid: int = 0, out_dir: str = "tmp_outputs", cache_dir: str = "timeloop_mapper_cache", cache_name: str = "cache", log_all: bool = False, verbose: bool = False, clean: bool = True) -> Dict[str, Any]:
         """
         Runs the mapper on a single workload.
@@ -489,8 +803,6 @@ class MapperFacade:
         Returns:
             Dict[str, Any]: A dictionary containing the best mapping's hardware parameters and total runtime of timeloop-mapper call.
         """
-        mapper = f"{self.configs_path}/mapper_heuristics/mapper_template.yaml"
-
         cache_file_path = os.path.join(cache_dir, f"{cache_name}.json.gz")
         cache = self._load_cache(cache_file_path)
         layer = workload.split("/")[-1].split(".")[0]
@@ -502,71 +814,112 @@ class MapperFacade:
         else:
             cache[layer] = {}  # Initialize cache[layer] as a dictionary
 
-        with open(mapper, "r") as map:
-            try:
-                config_dict = yaml.safe_load(map)
-            except yaml.YAMLError as e:
-                print(e)
-                sys.exit(1)
-
         # Modify the mapper heuristic settings for the given settings
-        config_dict = self._modify_mapper_configs(config_dict, heuristic, metrics, threads, total_valid, log_all)
-
-        # Write the modified YAML data to a temporary file
-        modified_mapper = "_".join(os.path.splitext(mapper)[0].split('_')[:-1]) + f"_{self._thread_id}.yaml"
-        with open(modified_mapper, "w") as modified_map:
-            yaml.dump(config_dict, modified_map)
+        config_dict = self._load_mapper_config(heuristic, metrics, threads, total_valid, log_all)
 
+        # Look up the results of a previous mapper run over the same layer shape and settings (possibly of another layer or model)
         start_time = time.time()
-        tmp_dir = f"{out_dir}_{self._thread_id}"
-        os.makedirs(tmp_dir, exist_ok=True)
-
-        # Running the timeloop-mapper for the given workload and chosen mapper heuristic settings
-        if verbose:
-            subprocess.run([self._mode, self.arch] + self.components + self.constraints + self.sparse_opt
-                           + [modified_mapper, workload, "-o", tmp_dir], check=True)
+        lut_key = self._mapper_lut_key(workload, config_dict)
+        result_dict = self._lookup_mapper_lut(lut_key, cache_dir)
+        if result_dict is not None:
+            runtime = time.time() - start_time
         else:
-            subprocess.run([self._mode, self.arch] + self.components + self.constraints + self.sparse_opt
-                           + [modified_mapper, workload, "-o", tmp_dir], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-
-        # Reading the CSV file into a dictionary
-        with open(f"{tmp_dir}/{self._mode}_{self._thread_id}.stats.csv", "r") as f:
-            reader = csv.DictReader(f)
-            result_dict = next(reader)
-
-        # Read the content of the text file to retrieve the total scalar accesses and Op per Byte
-        with open(f"{tmp_dir}/{self._mode}_{self._thread_id}.stats.txt", "r") as f:
-            data = f.read()
-            # Add the total scalar accesses, Op per Byte and memory size stats to the result dictionary
-            result_dict = extract_memory_stats(self._architecture, workload, data, result_dict)
+            result_dict, runtime = self._run_mapper(workload, mapper_config=config_dict, out_dir=out_dir, cache_dir=cache_dir, verbose=verbose, clean=clean)
+            self._store_mapper_lut(lut_key, result_dict, cache_dir)
 
-        # Read the content of the text file to retrieve the total scalar accesses and Op per Byte
-        file_paths = glob.glob(os.path.join(tmp_dir, '*map+stats.xml'))
+        cache[layer][bitwidth] = self._cache_entry(layer, bitwidth, batch_size, threads, heuristic, metrics, total_valid, result_dict, runtime)
+        self._save_cache(cache, cache_file_path)
 
-        # Add the xml data to the result dictionary
-        result_dict = parse_experiments_json(file_paths[0], result_dict=result_dict)
+        # Return dictionary with the best found HW params and total mapper runtime
+        return cache[layer][bitwidth]
 
-        # Calculate weights_memory_size
-        with open(workload, 'r') as work_file:
-            work_data = yaml.safe_load(work_file)
+    def _load_mapper_config(self, heuristic: str, metrics: Tuple[str, str], threads: Union[str, int], total_valid: int, log_all: bool) -> Dict[str, Any]:
+        """
+        Loads the mapper template configuration and modifies it based on specified settings.
+        The modified configuration is memoized per settings and must not be mutated by the caller.
 
-        # Deleting the tmp files
-        if clean:
-            shutil.rmtree(tmp_dir)
-            os.remove(modified_mapper)
-            [os.remove(f) for f in glob.glob('./*.log')]
+        Args:
+            heuristic (str): The heuristic type to use ('exhaustive', 'hybrid', 'linear', 'random').
+            metrics (Tuple[str, str]): A tuple of metrics to optimize for.
+            threads (Union[str, int]): The number of threads to use, or 'all' for all available threads.
+            total_valid (int): The number of total valid mappings to consider across all available mapper threads.
+            log_all (bool): Flag to enable logging of all mappings.
 
-        end_time = time.time()
-        runtime = end_time - start_time
-        threads = threads if threads != "all" else multiprocessing.cpu_count()
+        Returns:
+            Dict[str, Any]: The modified mapper configuration dictionary.
+        """
+        settings = (heuristic, tuple(metrics), threads, total_valid, log_all)
+        if settings not in self._mapper_configs:
+            with open(self._mapper_template, "r") as map:
+                try:
+                    config_dict = yaml.safe_load(map)
+                except yaml.YAMLError as e:
+                    print(e)
+                    sys.exit(1)
+            self._mapper_configs[settings] = self._modify_mapper_configs(config_dict, heuristic, metrics, threads, total_valid, log_all)
+        return self._mapper_configs[settings]
+
+    def _run_mapper(self, workload: str, mapper_config: Dict[str, Any], out_dir: str, cache_dir: str, verbose: bool, clean: bool) -> Tuple[Dict[str, Any], float]:
+        """
+        Invokes timeloop-mapper on a single workload and parses its outputs.
 
-        cache[layer][bitwidth] = {"Mode": self._mode, "HW": self._architecture, "Workload": layer, "Bitwidths": bitwidth, "Batch_size": batch_size, "Mapper heuristic": heuristic, "Total valid": total_valid, "Threads": threads, "Optimized_metric_1": metrics[0], "Optimized_metric_2": metrics[1], **result_dict, "Runtime [s]": "{:.2f}".format(runtime)}
-        self._save_cache(cache, cache_file_path)
+        Each call uses its own unique output directory, so multiple calls can run concurrently.
 
-        # Return dictionary with the best found HW params and total mapper runtime
-        return cache[layer][bitwidth]
+        Args:
+            workload (str): Relative path to the workload configuration file.
+            mapper_config (Dict[str, Any]): The modified mapper configuration dictionary.
+            out_dir (str): Relative path to the directory to store timeloop-mapper output files.
+            cache_dir (str): Relative path to the cache directory where the Accelergy energy and area reference tables are stored.
+            verbose (bool): Flag to enable printing the timeloop-mapper output.
+            clean (bool): Flag to clean up temporary files after execution.
 
-    def run_all_workloads(self, workloads: str, batch_size: int = 1, bitwidths: Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]] = None, threads: Union[str, int] = "all", heuristic: str = "random", metrics: Tuple[str, str] = ("edp", ""), total_valid: int = 0, out_dir: str = "tmp_outputs", cache_dir: str = "timeloop_mapper_cache", cache_name: str = "cache", log_all: bool = False, verbose: bool = False, clean: bool = True) -> Dict[str, Any]:
+        Returns:
+            Tuple[Dict[str, Any], float]: A dictionary containing the best mapping's hardware parameters and the runtime of the timeloop-mapper call.
+        """
+        start_time = time.time()
+        os.makedirs(out_dir, exist_ok=True)
+        # The mapper runs within its private output directory, so that any logs it emits into its working directory stay there too
+        tmp_dir = os.path.abspath(tempfile.mkdtemp(prefix=f"{workload.split('/')[-1].split('.')[0]}_", dir=out_dir))
+        try:
+            # Write the modified YAML data to a temporary file
+            modified_mapper = os.path.join(tmp_dir, "mapper.yaml")
+            with open(modified_mapper, "w") as modified_map:
+                yaml.dump(mapper_config, modified_map)
+
+            # Running the timeloop-mapper for the given workload and chosen mapper heuristic settings
+            energy_tables = self._energy_tables(cache_dir)
+            argv = [*self._argv_prefix, *energy_tables, modified_mapper, os.path.abspath(workload), "-o", tmp_dir]
+            if verbose:
+                subprocess.run(argv, cwd=tmp_dir, check=True)
+            else:
+                subprocess.run(argv, cwd=tmp_dir, stdout=self._devnull, stderr=self._devnull, check=True)
+
+            # Keep the energy reference tables generated by Accelergy for the subsequent calls
+            if not energy_tables:
+                self._store_energy_tables(tmp_dir, cache_dir)
+
+            # Reading the CSV file into a dictionary (a header and a single row of mapper stats without any quoted fields)
+            with open(f"{tmp_dir}/{self._out_prefix}.stats.csv", "r") as f:
+                header = f.readline().rstrip("\n")
+                row = f.readline().rstrip("\n")
+                result_dict = dict(zip(header.split(","), row.split(",")))
+
+            # Read the content of the text file to retrieve the total scalar accesses and Op per Byte
+            with open(f"{tmp_dir}/{self._out_prefix}.stats.txt", "r") as f:
+                data = f.read()
+                # Add the total scalar accesses, Op per Byte and memory size stats to the result dictionary
+                result_dict = extract_memory_stats(self._architecture, workload, data, result_dict)
+
+            # Add the xml data to the result dictionary
+            result_dict = parse_experiments_json(f"{tmp_dir}/{self._out_prefix}.map+stats.xml", result_dict=result_dict)
+        finally:
+            # Deleting the tmp files (including the logs emitted by the mapper)
+            if clean:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return result_dict, time.time() - start_time
+
+    def run_all_workloads(self, workloads: str, batch_size: int = 1, bitwidths: Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]] = None, threads: Union[str, int] = "all", heuristic: str = "random", metrics: Tuple[str, str] = ("edp", ""), total_valid: int = 0, out_dir: str = "tmp_outputs", cache_dir: str = "timeloop_mapper_cache", cache_name: str = "cache", log_all: bool = False, verbose: bool = False, clean: bool = True, parallel_workloads: int = 1) -> Dict[str, Any]:
         """
         Runs timeloop-mapper for all workloads (i.e. a CNN network's layers) in a given folder with specified mapper settings.
 
@@ -584,6 +937,7 @@ class MapperFacade:
             log_all (bool): Whether to log all mappings. Defaults to False.
             verbose (bool): Whether to print the timeloop-mapper output. Defaults to False.
             clean (bool): Flag to delete the temporary files generated by timeloop-mapper. Defaults to True.
+            parallel_workloads (int): The number of timeloop-mapper calls to run concurrently. With `threads` set to 'all', the available CPUs are split evenly between the concurrent calls. Defaults to 1.
 
         Returns:
             Dict[str, Any]: Dictionary containing the best mappings HW parameters and total runtime of the individual workloads timeloop-mapper calls.
@@ -591,7 +945,8 @@ class MapperFacade:
         workloads = glob.glob(f"{workloads}/*.yaml")
         hw_params = {}
 
-        # Retrieve parameters for each workload
+        # Determine the bitwidth configuration of each workload
+        workload_bitwidths = []
         for i, workload in enumerate(workloads):
             if bitwidths is None:
                 bitwidth = "native_native_native"
@@ -600,86 +955,101 @@ class MapperFacade:
             else:
                 key = list(bitwidths.keys())[i]
                 bitwidth = f"{bitwidths[key]['Inputs']}_{bitwidths[key]['Weights']}_{bitwidths[key]['Outputs']}"
-            hw_params[workload.split("/")[-1].split(".")[0]] = self.run_one_workload(workload=workload, batch_size=batch_size, bitwidth=bitwidth, threads=threads, heuristic=heuristic, metrics=metrics, total_valid=total_valid, out_dir=f"{out_dir}/{workload.split('/')[-1].split('.')[0]}", cache_dir=cache_dir, cache_name=cache_name, log_all=log_all, verbose=verbose, clean=clean)
-            print("Finished workload ", i+1, "/", len(workloads))
+            workload_bitwidths.append(bitwidth)
+
+        if parallel_workloads <= 1:
+            # Retrieve parameters for each workload
+            for i, (workload, bitwidth) in enumerate(zip(workloads, workload_bitwidths)):
+                hw_params[workload.split("/")[-1].split(".")[0]] = self.run_one_workload(workload=workload, batch_size=batch_size, bitwidth=bitwidth, threads=threads, heuristic=heuristic, metrics=metrics, total_valid=total_valid, out_dir=out_dir, cache_dir=cache_dir, cache_name=cache_name, log_all=log_all, verbose=verbose, clean=clean)
+                print("Finished workload ", i+1, "/", len(workloads))
+            # Return dictionary with individual workload's HW params and runtime
+            return hw_params
+
+        # Split the available CPUs evenly between the concurrent mapper calls
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(multiprocessing.cpu_count()))
+        parallel_workloads = min(parallel_workloads, len(cpus))
+        if threads == "all":
+            threads = len(cpus) // parallel_workloads
+        config_dict = self._load_mapper_config(heuristic, metrics, threads, total_valid, log_all)
+
+        # Resolve the cached workloads and collect the unique mapper runs for the rest
+        cache_file_path = os.path.join(cache_dir, f"{cache_name}.json.gz")
+        cache = self._load_cache(cache_file_path)
+        pending = {}
+        mapper_runs = {}
+        for workload, bitwidth in zip(workloads, workload_bitwidths):
+            layer = workload.split("/")[-1].split(".")[0]
+            if bitwidth in cache.get(layer, {}):
+                hw_params[layer] = cache[layer][bitwidth]
+                continue
+            lut_key = self._mapper_lut_key(workload, config_dict)
+            pending[layer] = (bitwidth, lut_key)
+            if lut_key not in mapper_runs and self._lookup_mapper_lut(lut_key, cache_dir) is None:
+                mapper_runs[lut_key] = workload
+
+        # Run the mapper calls concurrently, each worker process being pinned to its own set of CPUs
+        runtimes = {}
+        if mapper_runs:
+            cpu_sets = multiprocessing.Queue()
+            for i in range(parallel_workloads):
+                cpu_sets.put(cpus[i::parallel_workloads])
+            run_mapper = functools.partial(self._run_mapper, mapper_config=config_dict, out_dir=out_dir, cache_dir=cache_dir, verbose=verbose, clean=clean)
+            with ProcessPoolExecutor(max_workers=parallel_workloads, initializer=_pin_worker_cpus, initargs=(cpu_sets,)) as pool:
+                for i, (lut_key, (result_dict, runtime)) in enumerate(zip(mapper_runs, pool.map(run_mapper, mapper_runs.values()))):
+                    self._store_mapper_lut(lut_key, result_dict, cache_dir)
+                    runtimes[lut_key] = runtime
+                    print("Finished workload ", i+1, "/", len(mapper_runs))
+
+        for layer, (bitwidth, lut_key) in pending.items():
+            cache.setdefault(layer, {})[bitwidth] = self._cache_entry(layer, bitwidth, batch_size, threads, heuristic, metrics, total_valid, self._mapper_lut[lut_key], runtimes.get(lut_key, 0.0))
+            hw_params[layer] = cache[layer][bitwidth]
+        self._save_cache(cache, cache_file_path)
 
         # Return dictionary with individual workload's HW params and runtime
-        return hw_params
+        return {workload.split("/")[-1].split(".")[0]: hw_params[workload.split("/")[-1].split(".")[0]] for workload in workloads}
 
-    def get_hw_params_create_model(self, model: str, num_classes: int = 1000, batch_size: int = 1, bitwidths: Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]] = None, input_size: str = "224,224,3", threads: Union[str, int] = "all", heuristic: str = "random", metrics: Tuple[str, str] = ("edp", ""), total_valid: int = 0, out_dir: str = "tmp_outputs", cache_dir: str = "timeloop_mapper_cache", cache_name: str = "cache", log_all: bool = False, verbose: bool = False, clean: bool = True) -> Dict[str, Any]:
+    def create_model_yaml(self, model: str, num_classes: int = 1000, batch_size: int = 1, input_size: Union[str, Tuple[int, int, int]] = "224,224,3", verbose: bool = False) -> str:
         """
-        Creates a CNN model and runs timeloop-mapper on all its workloads (i.e. a CNN network's layers) with specified mapper settings.
+        Creates a CNN model and writes the templates for its individual CONV layers into a YAML file.
+
+        The YAML file is only created once for the same arguments within a process and reused by the subsequent calls (e.g. when sweeping over bitwidth settings), unless it was modified in the meantime.
 
         Args:
             model (str): PyTorch model (custom or torchvision) to be instantiated.
             num_classes (int): Number of classes for the classification task. Defaults to 1000.
             batch_size (int): The batch size for the model. Defaults to 1.
-            bitwidths (Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]]): The bitwidth settings for the model's workloads. Can be None for native settings, a tuple (i.e. (8,4,8) for uniform settings across layers, or a dictionary for non-uniform settings per layer (for example: `{"layer_1": {"Inputs": 8, "Weights": 4, "Outputs": 6},"layer_2": {"Inputs": 6, "Weights": 2, "Outputs": 5}}`). Defaults to None.
-            input_size (str): Input size of the model. Defaults to "224,224,3".
-            threads (Union[str, int]): The number of threads to use for the mapper heuristics, or 'all' for all available threads. Defaults to "all".
-            heuristic (str): The heuristic type to use for the mapper. Choices are `exhaustive`, `hybrid`, `linear` or `random`. Defaults to "random".
-            metrics (Tuple[str, str]): A tuple of two metrics to optimize for. Possible values are all six combinations of `energy`, `delay`, `lla` with an additional seventh option `edp`, leaving the second metric blank. Defaults to ("edp", "").
-            total_valid (int): The number of total valid mappings to consider across all available mapper threads. A value of 0 means that this criteria is not used for thread termination. Defaults to 0.
-            out_dir (str): Relative path to the output directory for the timeloop-mapper's output files. Defaults to "tmp_outputs".
-            cache_dir (str): Relative path to the cache directory where the timeloop-mapper cache file is stored. Defaults to "timeloop_mapper_cache".
-            cache_name (str): Name of the JSON cache file to store the results. Defaults to "cache".
-            log_all (bool): Whether to log all mappings. Defaults to False.
-            verbose (bool): Whether to print the timeloop-mapper output. Defaults to False.
-            clean (bool): Flag to delete the temporary files generated by timeloop-mapper. Defaults to True.
+            input_size (Union[str, Tuple[int, int, int]]): Input size of the model. Defaults to "224,224,3".
+            verbose (bool): Whether to print the created layers. Defaults to False.
 
         Returns:
-            Dict[str, Any]: A dictionary with hardware parameters and runtime for each workload of the created model.
+            str: Path to the YAML file with the model's layers.
         """
         if isinstance(input_size, str):
             input_size = tuple((int(d) for d in str.split(input_size, ",")))
-        # Create templates for individual model's CONV layers
-        create_pytorch_model(model_name=model, input_size=input_size, batch_size=batch_size, out_dir=os.path.join(self._DIR_PATH, "timeloop_utils/construct_workloads/parsed_models"), out_file=model, num_classes=num_classes, verbose=verbose)
-
-        # Construct timeloop workloads from the created templates and add to them the bitwidth settings
         yaml_model = f"{self._DIR_PATH}/timeloop_utils/construct_workloads/parsed_models/{model.split('/')[-1].split('.')[0]}.yaml"
-        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        workloads_location = f"{self.configs_path}/workload_shapes/{timestamp}"
 
-        if bitwidths is None:
-            construct_workloads(model=yaml_model, bitwidth_setting="native", uniform_width_set=None, non_uniform_width_set=None, out_dir=workloads_location, out_file=model, verbose=verbose)
-        elif isinstance(bitwidths, dict):
-            construct_workloads(model=yaml_model, bitwidth_setting="non-uniform", uniform_width_set=None, non_uniform_width_set=bitwidths, out_dir=workloads_location, out_file=model, verbose=verbose)
-        elif isinstance(bitwidths, tuple) and len(bitwidths) == 3 and all(isinstance(item, int) for item in bitwidths):
-            construct_workloads(model=yaml_model, bitwidth_setting="uniform", uniform_width_set=bitwidths, non_uniform_width_set=None, out_dir=workloads_location, out_file=model, verbose=verbose)
-        else:
-            print("Unrecognized bitwidths object. Expected dict, tuple or None to represent non-uniform, uniform and native bitwidhts settings, respectively.", file=sys.stderr)
-            sys.exit(0)
+        key = ("create", model, num_classes, batch_size, input_size)
+        if MapperFacade._model_yamls.get(key) != (yaml_model, os.path.getmtime(yaml_model) if os.path.exists(yaml_model) else None):
+            # Create templates for individual model's CONV layers
+            create_pytorch_model(model_name=model, input_size=input_size, batch_size=batch_size, out_dir=os.path.join(self._DIR_PATH, "timeloop_utils/construct_workloads/parsed_models"), out_file=model, num_classes=num_classes, verbose=verbose)
+            MapperFacade._model_yamls[key] = (yaml_model, os.path.getmtime(yaml_model))
+        return yaml_model
 
-        # Run timeloop-mapper on the created workloads
-        results = self.run_all_workloads(workloads=workloads_location, batch_size=batch_size, bitwidths=bitwidths, threads=threads, heuristic=heuristic, metrics=metrics, total_valid=total_valid, out_dir=out_dir, cache_dir=cache_dir, cache_name=cache_name, log_all=log_all, verbose=verbose, clean=clean)
-        # Clean up created workload_shapes files
-        if clean:
-            shutil.rmtree(workloads_location)
-        return results
-
-    def get_hw_params_parse_model(self, model: str, arch: str, batch_size: int = 1, bitwidths: Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]] = None, input_size: str = "224,224,3", threads: Union[str, int] = "all", heuristic: str = "random", metrics: Tuple[str, str] = ("edp", ""), total_valid: int = 0, out_dir: str = "tmp_outputs", cache_dir: str = "timeloop_mapper_cache", cache_name: str = "cache", log_all: bool = False, verbose: bool = False, clean: bool = True) -> Dict[str, Any]:
+    def parse_model_yaml(self, model: str, arch: str, batch_size: int = 1, input_size: str = "224,224,3", verbose: bool = False) -> str:
         """
-        Parses a CNN model and runs timeloop-mapper on all its workloads (i.e. a CNN network's layers) with specified mapper settings.
+        Parses a CNN model and writes the templates for its individual CONV layers into a YAML file.
+
+        The YAML file is only created once for the same (unmodified) model file and arguments within a process and reused by the subsequent calls (e.g. when sweeping over bitwidth settings), unless it was modified in the meantime.
 
         Args:
             model (str): Path to the CNN model or state_dict to be parsed.
             arch (str): Name of the PyTorch model (custom or torchvision) to be instantiated for the parsed model if only state_dict is provided.
             batch_size (int): The batch size for the model. Defaults to 1.
-            bitwidths (Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]]): The bitwidth settings for the model's workloads. Can be None for native settings, a tuple (i.e. (8,4,8) for uniform settings across layers, or a dictionary for non-uniform settings per layer (for example: `{"layer_1": {"Inputs": 8, "Weights": 4, "Outputs": 6},"layer_2": {"Inputs": 6, "Weights": 2, "Outputs": 5}}`). Defaults to None.
             input_size (str): Input size of the model. Defaults to "224,224,3".
-            threads (Union[str, int]): The number of threads to use for the mapper heuristics, or 'all' for all available threads. Defaults to "all".
-            heuristic (str): The heuristic type to use for the mapper. Choices are `exhaustive`, `hybrid`, `linear` or `random`. Defaults to "random".
-            metrics (Tuple[str, str]): A tuple of two metrics to optimize for. Possible values are all six combinations of `energy`, `delay`, `lla` with an additional seventh option `edp`, leaving the second metric blank. Defaults to ("edp", "").
-            total_valid (int): The number of total valid mappings to consider across all available mapper threads. A value of 0 means that this criteria is not used for thread termination. Defaults to 0.
-            out_dir (str): Relative path to the output directory for the timeloop-mapper's output files. Defaults to "tmp_outputs".
-            cache_dir (str): Relative path to the cache directory where the timeloop-mapper cache file is stored. Defaults to "timeloop_mapper_cache".
-            cache_name (str): Name of the JSON cache file to store the results. Defaults to "cache".
-            log_all (bool): Whether to log all mappings. Defaults to False.
-            verbose (bool): Whether to print the timeloop-mapper output. Defaults to False.
-            clean (bool): Flag to delete the temporary files generated by timeloop-mapper. Defaults to True.
+            verbose (bool): Whether to print the parsed layers. Defaults to False.
 
         Returns:
-            Dict[str, Any]: A dictionary with hardware parameters and runtime for each workload of the parsed model.
+            str: Path to the YAML file with the model's layers.
         """
         if not os.path.exists(model):
             raise FileNotFoundError(f"No model file `{model}` found.")
@@ -693,31 +1063,116 @@ class MapperFacade:
 
         assert model_ext in ["pth", "pt", "pth.tar", "pt.tar"], "Unrecognized model file extension. Expected .pt, .pth, .pt.tar or .pth.tar for PyTorch model."
 
-        # Create templates for individual model's CONV layers        
-        parse_pytorch_model(model_file=model, input_size=input_size, batch_size=batch_size, out_dir=os.path.join(self._DIR_PATH, "timeloop_utils/construct_workloads/parsed_models"), out_file=model.split("/")[-1].split(".")[0], architecture=arch, verbose=verbose)
+        yaml_model = f"{self._DIR_PATH}/timeloop_utils/construct_workloads/parsed_models/{model.split('/')[-1].split('.')[0]}.yaml"
+
+        key = ("parse", os.path.abspath(model), os.path.getmtime(model), arch, batch_size, input_size)
+        if MapperFacade._model_yamls.get(key) != (yaml_model, os.path.getmtime(yaml_model) if os.path.exists(yaml_model) else None):
+            # Create templates for individual model's CONV layers
+            parse_pytorch_model(model_file=model, input_size=input_size, batch_size=batch_size, out_dir=os.path.join(self._DIR_PATH, "timeloop_utils/construct_workloads/parsed_models"), out_file=model.split("/")[-1].split(".")[0], architecture=arch, verbose=verbose)
+            MapperFacade._model_yamls[key] = (yaml_model, os.path.getmtime(yaml_model))
+        return yaml_model
+
+    def _run_with_bitwidths(self, yaml_model: str, out_file: str, batch_size: int, bitwidths: Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]], threads: Union[str, int], heuristic: str, metrics: Tuple[str, str], total_valid: int, out_dir: str, cache_dir: str, cache_name: str, log_all: bool, verbose: bool, clean: bool, parallel_workloads: int) -> Dict[str, Any]:
+        """
+        Constructs timeloop workloads with the given bitwidth settings from a YAML file of the model's layers and runs timeloop-mapper on all of them.
+
+        Args:
+            yaml_model (str): Path to the YAML file with the model's layers.
+            out_file (str): Base name for the workload files.
+            batch_size (int): The batch size for the model.
+            bitwidths (Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]]): The bitwidth settings for the model's workloads. Can be None for native settings, a tuple for uniform settings across layers, or a dictionary for non-uniform settings per layer.
+            threads (Union[str, int]): The number of threads to use for the mapper heuristics, or 'all' for all available threads.
+            heuristic (str): The heuristic type to use for the mapper. Choices are `exhaustive`, `hybrid`, `linear` or `random`.
+            metrics (Tuple[str, str]): A tuple of two metrics to optimize for.
+            total_valid (int): The number of total valid mappings to consider across all available mapper threads.
+            out_dir (str): Relative path to the output directory for the timeloop-mapper's output files.
+            cache_dir (str): Relative path to the cache directory where the timeloop-mapper cache file is stored.
+            cache_name (str): Name of the JSON cache file to store the results.
+            log_all (bool): Whether to log all mappings.
+            verbose (bool): Whether to print the timeloop-mapper output.
+            clean (bool): Flag to delete the temporary files generated by timeloop-mapper.
+            parallel_workloads (int): The number of timeloop-mapper calls to run concurrently.
 
+        Returns:
+            Dict[str, Any]: A dictionary with hardware parameters and runtime for each workload of the model.
+        """
         # Construct timeloop workloads from the created templates and add to them the bitwidth settings
-        yaml_model = f"{self._DIR_PATH}/timeloop_utils/construct_workloads/parsed_models/{model.split('/')[-1].split('.')[0]}.yaml"
         timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
         workloads_location = f"{self.configs_path}/workload_shapes/{timestamp}"
 
         if bitwidths is None:
-            construct_workloads(model=yaml_model, bitwidth_setting="native", uniform_width_set=None, non_uniform_width_set=None, out_dir=workloads_location, out_file=arch, verbose=verbose)
+            construct_workloads(model=yaml_model, bitwidth_setting="native", uniform_width_set=None, non_uniform_width_set=None, out_dir=workloads_location, out_file=out_file, verbose=verbose)
         elif isinstance(bitwidths, dict):
-            construct_workloads(model=yaml_model, bitwidth_setting="non-uniform", uniform_width_set=None, non_uniform_width_set=bitwidths, out_dir=workloads_location, out_file=arch, verbose=verbose)
+            construct_workloads(model=yaml_model, bitwidth_setting="non-uniform", uniform_width_set=None, non_uniform_width_set=bitwidths, out_dir=workloads_location, out_file=out_file, verbose=verbose)
         elif isinstance(bitwidths, tuple) and len(bitwidths) == 3 and all(isinstance(item, int) for item in bitwidths):
-            construct_workloads(model=yaml_model, bitwidth_setting="uniform", uniform_width_set=bitwidths, non_uniform_width_set=None, out_dir=workloads_location, out_file=arch, verbose=verbose)
+            construct_workloads(model=yaml_model, bitwidth_setting="uniform", uniform_width_set=bitwidths, non_uniform_width_set=None, out_dir=workloads_location, out_file=out_file, verbose=verbose)
         else:
             print("Unrecognized bitwidths object. Expected dict, tuple or None to represent non-uniform, uniform and native bitwidhts settings, respectively.", file=sys.stderr)
             sys.exit(0)
 
         # Run timeloop-mapper on the created workloads
-        results = self.run_all_workloads(workloads=workloads_location, batch_size=batch_size, bitwidths=bitwidths, threads=threads, heuristic=heuristic, metrics=metrics, total_valid=total_valid, out_dir=out_dir, cache_dir=cache_dir, cache_name=cache_name, log_all=log_all, verbose=verbose, clean=clean)
+        results = self.run_all_workloads(workloads=workloads_location, batch_size=batch_size, bitwidths=bitwidths, threads=threads, heuristic=heuristic, metrics=metrics, total_valid=total_valid, out_dir=out_dir, cache_dir=cache_dir, cache_name=cache_name, log_all=log_all, verbose=verbose, clean=clean, parallel_workloads=parallel_workloads)
         # Clean up created workload_shapes files
         if clean:
             shutil.rmtree(workloads_location)
         return results
 
+    def get_hw_params_create_model(self, model: str, num_classes: int = 1000, batch_size: int = 1, bitwidths: Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]] = None, input_size: str = "224,224,3", threads: Union[str, int] = "all", heuristic: str = "random", metrics: Tuple[str, str] = ("edp", ""), total_valid: int = 0, out_dir: str = "tmp_outputs", cache_dir: str = "timeloop_mapper_cache", cache_name: str = "cache", log_all: bool = False, verbose: bool = False, clean: bool = True, parallel_workloads: int = 1) -> Dict[str, Any]:
+        """
+        Creates a CNN model and runs timeloop-mapper on all its workloads (i.e. a CNN network's layers) with specified mapper settings.
+
+        Args:
+            model (str): PyTorch model (custom or torchvision) to be instantiated.
+            num_classes (int): Number of classes for the classification task. Defaults to 1000.
+            batch_size (int): The batch size for the model. Defaults to 1.
+            bitwidths (Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]]): The bitwidth settings for the model's workloads. Can be None for native settings, a tuple (i.e. (8,4,8) for uniform settings across layers, or a dictionary for non-uniform settings per layer (for example: `{"layer_1": {"Inputs": 8, "Weights": 4, "Outputs": 6},"layer_2": {"Inputs": 6, "Weights": 2, "Outputs": 5}}`). Defaults to None.
+            input_size (str): Input size of the model. Defaults to "224,224,3".
+            threads (Union[str, int]): The number of threads to use for the mapper heuristics, or 'all' for all available threads. Defaults to "all".
+            heuristic (str): The heuristic type to use for the mapper. Choices are `exhaustive`, `hybrid`, `linear` or `random`. Defaults to "random".
+            metrics (Tuple[str, str]): A tuple of two metrics to optimize for. Possible values are all six combinations of `energy`, `delay`, `lla` with an additional seventh option `edp`, leaving the second metric blank. Defaults to ("edp", "").
+            total_valid (int): The number of total valid mappings to consider across all available mapper threads. A value of 0 means that this criteria is not used for thread termination. Defaults to 0.
+            out_dir (str): Relative path to the output directory for the timeloop-mapper's output files. Defaults to "tmp_outputs".
+            cache_dir (str): Relative path to the cache directory where the timeloop-mapper cache file is stored. Defaults to "timeloop_mapper_cache".
+            cache_name (str): Name of the JSON cache file to store the results. Defaults to "cache".
+            log_all (bool): Whether to log all mappings. Defaults to False.
+            verbose (bool): Whether to print the timeloop-mapper output. Defaults to False.
+            clean (bool): Flag to delete the temporary files generated by timeloop-mapper. Defaults to True.
+            parallel_workloads (int): The number of timeloop-mapper calls to run concurrently. Defaults to 1.
+
+        Returns:
+            Dict[str, Any]: A dictionary with hardware parameters and runtime for each workload of the created model.
+        """
+        yaml_model = self.create_model_yaml(model=model, num_classes=num_classes, batch_size=batch_size, input_size=input_size, verbose=verbose)
+        return self._run_with_bitwidths(yaml_model=yaml_model, out_file=model, batch_size=batch_size, bitwidths=bitwidths, threads=threads, heuristic=heuristic, metrics=metrics, total_valid=total_valid, out_dir=out_dir, cache_dir=cache_dir, cache_name=cache_name, log_all=log_all, verbose=verbose, clean=clean, parallel_workloads=parallel_workloads)
+
+    def get_hw_params_parse_model(self, model: str, arch: str, batch_size: int = 1, bitwidths: Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]] = None, input_size: str = "224,224,3", threads: Union[str, int] = "all", heuristic: str = "random", metrics: Tuple[str, str] = ("edp", ""), total_valid: int = 0, out_dir: str = "tmp_outputs", cache_dir: str = "timeloop_mapper_cache", cache_name: str = "cache", log_all: bool = False, verbose: bool = False, clean: bool = True, parallel_workloads: int = 1) -> Dict[str, Any]:
+        """
+        Parses a CNN model and runs timeloop-mapper on all its workloads (i.e. a CNN network's layers) with specified mapper settings.
+
+        Args:
+            model (str): Path to the CNN model or state_dict to be parsed.
+            arch (str): Name of the PyTorch model (custom or torchvision) to be instantiated for the parsed model if only state_dict is provided.
+            batch_size (int): The batch size for the model. Defaults to 1.
+            bitwidths (Optional[Union[Tuple[int, int, int], Dict[str, Dict[str, int]]]]): The bitwidth settings for the model's workloads. Can be None for native settings, a tuple (i.e. (8,4,8) for uniform settings across layers, or a dictionary for non-uniform settings per layer (for example: `{"layer_1": {"Inputs": 8, "Weights": 4, "Outputs": 6},"layer_2": {"Inputs": 6, "Weights": 2, "Outputs": 5}}`). Defaults to None.
+            input_size (str): Input size of the model. Defaults to "224,224,3".
+            threads (Union[str, int]): The number of threads to use for the mapper heuristics, or 'all' for all available threads. Defaults to "all".
+            heuristic (str): The heuristic type to use for the mapper. Choices are `exhaustive`, `hybrid`, `linear` or `random`. Defaults to "random".
+            metrics (Tuple[str, str]): A tuple of two metrics to optimize for. Possible values are all six combinations of `energy`, `delay`, `lla` with an additional seventh option `edp`, leaving the second metric blank. Defaults to ("edp", "").
+            total_valid (int): The number of total valid mappings to consider across all available mapper threads. A value of 0 means that this criteria is not used for thread termination. Defaults to 0.
+            out_dir (str): Relative path to the output directory for the timeloop-mapper's output files. Defaults to "tmp_outputs".
+            cache_dir (str): Relative path to the cache directory where the timeloop-mapper cache file is stored. Defaults to "timeloop_mapper_cache".
+            cache_name (str): Name of the JSON cache file to store the results. Defaults to "cache".
+            log_all (bool): Whether to log all mappings. Defaults to False.
+            verbose (bool): Whether to print the timeloop-mapper output. Defaults to False.
+            clean (bool): Flag to delete the temporary files generated by timeloop-mapper. Defaults to True.
+            parallel_workloads (int): The number of timeloop-mapper calls to run concurrently. Defaults to 1.
+
+        Returns:
+            Dict[str, Any]: A dictionary with hardware parameters and runtime for each workload of the parsed model.
+        """
+        yaml_model = self.parse_model_yaml(model=model, arch=arch, batch_size=batch_size, input_size=input_size, verbose=verbose)
+        return self._run_with_bitwidths(yaml_model=yaml_model, out_file=arch, batch_size=batch_size, bitwidths=bitwidths, threads=threads, heuristic=heuristic, metrics=metrics, total_valid=total_valid, out_dir=out_dir, cache_dir=cache_dir, cache_name=cache_name, log_all=log_all, verbose=verbose, clean=clean, parallel_workloads=parallel_workloads)
+
 
 if __name__ == "__main__":
     # For example runs
@@ -27,16 +27,59 @@
 # Modifications to the original script made by: Jan Klhufek (iklhufek@fit.vut.cz)
 
 import functools
+import copy
 import yaml
 import argparse
 from argparse import RawTextHelpFormatter
 import json
 import os
-import inspect
 import sys
-from typing import Dict, Tuple, List, Union, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple, List, Union, Any, Iterator
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+try:
+    # Optional, considerably faster reader of large model files
+    import ryml
+except ImportError:
+    ryml = None
+try:
+    # Optional, faster JSON parser
+    import orjson
+except ImportError:
+    orjson = None
+DIR_PATH = os.path.dirname(os.path.abspath(__file__))
 WorkloadBounds = Tuple[int, int, int, int, int, int, int, int, int, int, int]
 
+# Minimum number of layers for which the workloads are written by a pool of worker processes
+# (below it, the pool startup costs more than the per-layer work it spreads out)
+PARALLEL_LAYERS_THRESHOLD = 64
+
+# Per-layer parts of a workload, laid out as the indented JSON of the problem instance (see `split_workload_template`)
+_INSTANCE_PLACEHOLDER = "<instance>"
+_INSTANCE_KEYS = ("C", "M", "N", "P", "Q", "R", "S", "Wdilation", "Wstride", "Hdilation", "Hstride")
+_INSTANCE_FORMAT = (b'{\n'
+                    b'      "C": %d,\n'
+                    b'      "M": %d,\n'
+                    b'      "N": %d,\n'
+                    b'      "P": %d,\n'
+                    b'      "Q": %d,\n'
+                    b'      "R": %d,\n'
+                    b'      "S": %d,\n'
+                    b'      "Wdilation": 1,\n'
+                    b'      "Wstride": %d,\n'
+                    b'      "Hdilation": 1,\n'
+                    b'      "Hstride": %d%s%s\n'
+                    b'    }')
+_BITWIDTHS_FORMAT = (b',\n'
+                     b'      "bitwidths": {\n'
+                     b'        "Inputs": %d,\n'
+                     b'        "Weights": %d,\n'
+                     b'        "Outputs": %d\n'
+                     b'      }')
+
 
 def parse_args() -> argparse.Namespace:
     """
@@ -81,78 +124,203 @@ def json_file_to_dict(file_path: str) -> Dict:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"The file `{file_path}` does not exist.")
 
-    with open(file_path, "r") as f:
-        return json.load(f)
+    # The modification time is part of the cache key, so an edited file gets re-read;
+    # a copy is returned so that callers cannot alter the cached content
+    file_path = os.path.abspath(file_path)
+    return copy.deepcopy(_load_json_file(file_path, os.path.getmtime(file_path)))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_file(file_path: str, mtime: float) -> Dict:
+    """
+    Reads and caches the content of a JSON file (through orjson if it is installed).
+
+    Args:
+        file_path (str): The absolute path to the JSON file.
+        mtime (float): The modification time of the file, distinguishing its versions in the cache.
+
+    Returns:
+        Dict: The content of the JSON file as a dictionary.
+    """
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
+def iter_model_layers(model_file: str) -> Iterator[WorkloadBounds]:
+    """
+    Streams the layer dimensions from a model YAML file one layer at a time, without constructing the whole document.
+
+    Args:
+        model_file (str): Path to a YAML file containing model layer descriptions.
 
-def rewrite_workload_bounds(src: str, dst: str, workload_bounds: WorkloadBounds, verbose: bool, bitwidth_setting: str, uniform_width: Union[Tuple[int, int, int], None], non_uniform_width: Union[Dict[str, int], None]) -> None:
+    Yields:
+        WorkloadBounds: Dimensions of the next layer listed under the `layers` key.
     """
-    Rewrite the workload bounds in a YAML configuration file based on the provided bounds and bitwidth settings.
+    depth = 0
+    key = None
+    expect_key = True
+    in_layers = False
+    layer = []
+    layer_anchor = None
+    # Values of the anchored scalars and layers, resolving their aliases
+    anchors = {}
+    with open(model_file, "r") as f:
+        for event in yaml.parse(f, Loader=_Loader):
+            if isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+                if isinstance(event, yaml.ScalarEvent):
+                    value = event.value
+                    if event.anchor is not None:
+                        anchors[event.anchor] = value
+                else:
+                    value = anchors.get(event.anchor)
+                if depth == 1:
+                    # Top-level scalars and aliases alternate between keys and their values
+                    if expect_key:
+                        key = value
+                    expect_key = not expect_key
+                elif in_layers and depth == 3:
+                    layer.append(int(value))
+                elif in_layers and depth == 2:
+                    # A whole layer given as an alias of a previous one
+                    yield value
+            elif isinstance(event, yaml.CollectionStartEvent):
+                depth += 1
+                if depth == 2:
+                    # A top-level collection is always a value
+                    in_layers = key == "layers" and isinstance(event, yaml.SequenceStartEvent)
+                    expect_key = True
+                elif in_layers and depth == 3:
+                    layer = []
+                    layer_anchor = event.anchor
+            elif isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+                if in_layers and depth == 2:
+                    bounds = tuple(layer)
+                    if layer_anchor is not None:
+                        anchors[layer_anchor] = bounds
+                    yield bounds
+                elif in_layers and depth == 1:
+                    # Nothing past the layers is needed
+                    return
+
+    print(f"The input dnn model `{model_file}` does not contain a `layers` sequence")
+    sys.exit(1)
+
+
+def read_model_layers_ryml(model_file: str) -> List[WorkloadBounds]:
+    """
+    Reads the layer dimensions from a model YAML file using rapidyaml (requires the optional `ryml` package).
 
     Args:
-        src (str): Source YAML file path.
+        model_file (str): Path to a YAML file containing model layer descriptions.
+
+    Returns:
+        List[WorkloadBounds]: Dimensions of the layers listed under the `layers` key.
+    """
+    with open(model_file, "rb") as f:
+        tree = ryml.parse_in_arena(f.read())
+    # Expand the aliases, which would otherwise be emitted as references
+    tree.resolve()
+    layers_node = tree.find_child(tree.root_id(), b"layers")
+    if layers_node == ryml.NONE:
+        print(f"The input dnn model `{model_file}` does not contain a `layers` sequence")
+        sys.exit(1)
+    # Converting the integer-only layers subtree through JSON avoids a Python-level call per scalar node
+    layers = json.loads("{" + ryml.emit_json(tree, layers_node) + "}")["layers"]
+    return [tuple(layer) for layer in layers]
+
+
+def split_workload_template(template_cfg: Dict[str, Any]) -> Tuple[bytes, bytes, bytes]:
+    """
+    Serializes the template workload configuration once, leaving out the problem instance dimensions that differ for each layer.
+
+    Args:
+        template_cfg (Dict[str, Any]): Parsed template workload configuration (left unmodified).
+
+    Returns:
+        Tuple[bytes, bytes, bytes]: JSON-formatted template parts preceding the problem instance, the remaining (non-dimension)
+        entries of the template's instance, such as densities, and the template part following the problem instance.
+    """
+    instance = template_cfg['problem'].get('instance') or {}
+    if 'bitwidths' in instance:
+        raise ValueError("The workload template must not define bitwidths, they are set for each layer by the bitwidth settings")
+
+    # Keep the template's other instance entries, laid out at the depth of the instance entries
+    extra_entries = {k: v for k, v in instance.items() if k not in _INSTANCE_KEYS}
+    extra_data = ""
+    if extra_entries:
+        extra_data = "," + json.dumps(extra_entries, indent=2)[1:-2].replace("\n", "\n    ")
+
+    config = {**template_cfg, 'problem': {**template_cfg['problem'], 'instance': _INSTANCE_PLACEHOLDER}}
+    prefix, suffix = json.dumps(config, indent=2).split(json.dumps(_INSTANCE_PLACEHOLDER))
+    return prefix.encode(), extra_data.encode(), suffix.encode()
+
+
+def rewrite_workload_bounds(template: Tuple[bytes, bytes, bytes], dst: str, workload_bounds: WorkloadBounds, verbose: bool, bitwidths: Union[Dict[str, int], None]) -> None:
+    """
+    Rewrite the workload bounds in a YAML configuration file based on the provided bounds and bitwidths.
+
+    Args:
+        template (Tuple[bytes, bytes, bytes]): Serialized template parts surrounding and completing the problem instance (see `split_workload_template`).
         dst (str): Destination YAML file path.
         workload_bounds (WorkloadBounds): A tuple of integers representing workload dimensions.
         verbose (bool): Flag to enable verbose output.
-        bitwidth_setting (str): The bitwidth setting ('uniform' or 'non-uniform').
-        uniform_width (Tuple[int, int, int], optional): Uniform bitwidths for Inputs, Weights, Outputs.
-        non_uniform_width (Dict[str, int], optional): Non-uniform bitwidths for Inputs, Weights, Outputs.
+        bitwidths (Dict[str, int], optional): Bitwidths for Inputs, Weights, Outputs; None keeps the native bitwidths.
     """
     w, h, c, n, m, s, r, wpad, hpad, wstride, hstride = workload_bounds
-    q = int((w - s + 2 * wpad) / wstride) + 1
-    p = int((h - r + 2 * hpad) / hstride) + 1
+    q = (w - s + 2 * wpad) // wstride + 1
+    p = (h - r + 2 * hpad) // hstride + 1
 
     if verbose:
-        print('Workload Dimensions:')
-        print('  W        =', w)
-        print('  H        =', h)
-        print('  C        =', c)
-        print('  M        =', m)
-        print('  S        =', s)
-        print('  R        =', r)
-        print('  P        =', p)
-        print('  Q        =', q)
-        print('  N        =', n)
-        print('  W-pad    =', wpad)
-        print('  H-pad    =', hpad)
-        print('  W-stride =', wstride)
-        print('  H-stride =', hstride)
-        print()
-
-    with open(src, "r") as f:
-        config = yaml.load(f, Loader=yaml.SafeLoader)
-
-    config['problem']['instance']['R'] = r
-    config['problem']['instance']['S'] = s
-    config['problem']['instance']['P'] = p
-    config['problem']['instance']['Q'] = q
-    config['problem']['instance']['C'] = c
-    config['problem']['instance']['M'] = m
-    config['problem']['instance']['N'] = n
-    config['problem']['instance']['Wstride'] = wstride
-    config['problem']['instance']['Hstride'] = hstride
-    config['problem']['instance']['Wdilation'] = 1
-    config['problem']['instance']['Hdilation'] = 1
-
-    if bitwidth_setting == 'uniform':
-        bitwidths_dict = {
-            'Inputs': uniform_width[0],
-            'Weights': uniform_width[1],
-            'Outputs': uniform_width[2]
-        }
-        config['problem']['instance']['bitwidths'] = bitwidths_dict
-    elif bitwidth_setting == 'non-uniform':
-        # Convert dictionary keys to lowercase (preventing possible errors due to case sensitivity)
-        non_uniform_width = {k.lower(): v for k, v in non_uniform_width.items()}
-        bitwidths_dict = {
-            'Inputs': non_uniform_width["inputs"],
-            'Weights': non_uniform_width["weights"],
-            'Outputs': non_uniform_width["outputs"]
-        }
-        config['problem']['instance']['bitwidths'] = bitwidths_dict
+        sys.stdout.write(
+            'Workload Dimensions:\n'
+            f'  W        = {w}\n'
+            f'  H        = {h}\n'
+            f'  C        = {c}\n'
+            f'  M        = {m}\n'
+            f'  S        = {s}\n'
+            f'  R        = {r}\n'
+            f'  P        = {p}\n'
+            f'  Q        = {q}\n'
+            f'  N        = {n}\n'
+            f'  W-pad    = {wpad}\n'
+            f'  H-pad    = {hpad}\n'
+            f'  W-stride = {wstride}\n'
+            f'  H-stride = {hstride}\n'
+            '\n'
+        )
+
+    # YAML is a superset of JSON, so Timeloop reads the JSON-formatted workload as is;
+    # only the problem instance is formatted per layer, the rest of the template is serialized once
+    bitwidths_data = b'' if bitwidths is None else _BITWIDTHS_FORMAT % (bitwidths['Inputs'], bitwidths['Weights'], bitwidths['Outputs'])
+    prefix, extra_data, suffix = template
+    data = prefix + _INSTANCE_FORMAT % (c, m, n, p, q, r, s, wstride, hstride, extra_data, bitwidths_data) + suffix
+
+    # The small output is written at once, bypassing Python's buffered text I/O
+    fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        # A single write may be cut short (e.g. by a signal), so continue until the whole workload is written
+        remaining = memoryview(data)
+        while remaining:
+            written = os.write(fd, remaining)
+            if written == 0:
+                raise OSError(f"Could not write the workload to `{dst}`")
+            remaining = remaining[written:]
+    finally:
+        os.close(fd)
+
+
+def _write_layer_workload(layer_args: Tuple[str, WorkloadBounds, Union[Dict[str, int], None]], **kwargs: Any) -> None:
+    """
+    Writes the workload of a single layer; a module-level wrapper of `rewrite_workload_bounds` usable by a process pool.
 
-    with open(dst, "w") as f:
-        f.write(yaml.dump(config))
+    Args:
+        layer_args (Tuple[str, WorkloadBounds, Dict[str, int]]): Destination file path, workload dimensions and bitwidths of the layer.
+        **kwargs (Any): Remaining keyword arguments shared by all layers, passed to `rewrite_workload_bounds`.
+    """
+    dst, workload_bounds, bitwidths = layer_args
+    rewrite_workload_bounds(dst=dst, workload_bounds=workload_bounds, bitwidths=bitwidths, **kwargs)
 
 
 def create_folder(directory: str) -> None:
@@ -163,8 +331,7 @@ def create_folder(directory: str) -> None:
         directory (str): The directory path where the folder will be created.
     """
     try:
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        os.makedirs(directory, exist_ok=True)
     except OSError:
         print("ERROR: Creating directory. " + directory)
         sys.exit()
@@ -183,10 +350,6 @@ def construct_workloads(model: str, bitwidth_setting: str, out_file: str, out_di
         uniform_width_set (Tuple[int, int, int], optional): Uniform bitwidths for Inputs, Weights, Outputs.
         non_uniform_width_set (Dict[str, int], optional): Non-uniform bitwidths for each layer.
     """
-    # Get current directory name
-    this_file_path = os.path.abspath(inspect.getfile(inspect.currentframe()))
-    this_directory = os.path.dirname(this_file_path)
-
     model_file = model
     if not model_file.endswith(".yaml"):
         print(f"The input dnn model `{model_file}` is expected to be a yaml file")
@@ -213,35 +376,60 @@ def construct_workloads(model: str, bitwidth_setting: str, out_file: str, out_di
         sys.exit(0)
 
     # Construct appropriate folder and file paths
-    if not os.path.exists(out_dir):
-        create_folder(out_dir)
-    config_abspath = os.path.join(this_directory, "temps/sample.yaml")
+    create_folder(out_dir)
+    out_dir_abs = os.path.abspath(out_dir)
+    config_abspath = os.path.join(DIR_PATH, "temps/sample.yaml")
 
-    # Just test that path points to a valid config file.
+    # Parse the workload template once (also validating it) and serialize the parts shared by all layers
     with open(config_abspath, "r") as f:
-        yaml.load(f, Loader=yaml.SafeLoader)
+        template = split_workload_template(yaml.load(f, Loader=_Loader))
 
-    # Load the model from the YAML file
-    with open((model_file), "r") as f:
-        model = yaml.load(f, Loader=yaml.SafeLoader)
+    # Read the layer dimensions from the model YAML file (through rapidyaml if it is installed)
+    if ryml is not None:
+        layers = read_model_layers_ryml(model_file)
+    else:
+        layers = list(iter_model_layers(model_file))
 
     # Check if the number of layer and the number of desired non-uniform bitwidths to be applied match
-    if bitwidth_setting == "non-uniform" and len(non_uniform_width_set) != len(model['layers']):
+    if bitwidth_setting == "non-uniform" and len(non_uniform_width_set) != len(layers):
         print("The number of layers in the model and the number of non-uniform bitwidths to be applied must match")
         sys.exit(0)
 
+    if bitwidth_setting == "uniform":
+        # All layers share the same bitwidths
+        uniform_widths = {'Inputs': uniform_width_set[0], 'Weights': uniform_width_set[1], 'Outputs': uniform_width_set[2]}
+    elif bitwidth_setting == "non-uniform":
+        # Convert dictionary keys to lowercase (preventing possible errors due to case sensitivity)
+        normalized_widths = [{k.lower(): v for k, v in layer_widths.items()} for layer_widths in non_uniform_width_set.values()]
+
+    # Select how the bitwidths of each layer are obtained once, rather than per layer
+    def native_bitwidths(i: int) -> None:
+        return None
+
+    def uniform_bitwidths(i: int) -> Dict[str, int]:
+        return uniform_widths
+
+    def non_uniform_bitwidths(i: int) -> Dict[str, int]:
+        widths = normalized_widths[i]
+        return {'Inputs': widths["inputs"], 'Weights': widths["weights"], 'Outputs': widths["outputs"]}
+
+    layer_bitwidths = {"native": native_bitwidths, "uniform": uniform_bitwidths, "non-uniform": non_uniform_bitwidths}[bitwidth_setting]
+
     # Construct problem shapes for each layer
-    if bitwidth_setting == "non-uniform":
-        workload_keys = list(non_uniform_width_set.keys())
-    non_uniform_width = {}
-
-    for i, layer in enumerate(model['layers']):
-        problem = layer
-        file_name = out_file + "_" + "layer" + str(i+1) + ".yaml"
-        file_path = os.path.abspath(os.path.join(out_dir, file_name))
-        if bitwidth_setting == "non-uniform":
-            non_uniform_width = non_uniform_width_set[workload_keys[i]]
-        rewrite_workload_bounds(src=config_abspath, dst=file_path, workload_bounds=problem, verbose=verbose, bitwidth_setting=bitwidth_setting, uniform_width=uniform_width_set, non_uniform_width=non_uniform_width)
+    layers_args = []
+    for i, layer in enumerate(layers):
+        file_path = f"{out_dir_abs}/{out_file}_layer{i+1}.yaml"
+        layers_args.append((file_path, layer, layer_bitwidths(i)))
+
+    write_layer = functools.partial(_write_layer_workload, template=template, verbose=verbose)
+    # Spread the layers of larger models across processes (verbose runs stay serial to keep the printed layer order)
+    workers = os.cpu_count() or 1
+    if not verbose and workers > 1 and len(layers_args) >= PARALLEL_LAYERS_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(write_layer, layers_args, chunksize=-(-len(layers_args) // workers)))
+    else:
+        for layer_args in layers_args:
+            write_layer(layer_args)
 
 
 if __name__ == "__main__":